@@ -1,13 +1,29 @@
 
-import json
-import csv
+import math
+import numpy as np
 import pandas as pd
 import os
+import re
+import functools
+import importlib.util
+import hashlib
+import pickle
+import tempfile
 from datetime import timedelta, datetime
-from geopy.distance import great_circle
-from ics import Calendar
 from collections import defaultdict
 
+# Prefer the C (yajl2) backend for streaming JSON parsing when it is available
+try:
+    import ijson.backends.yajl2_c as ijson
+except ImportError:
+    import ijson
+
+# Numba is optional: when installed, cluster detection runs as a single compiled loop
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 # Default settings - file paths based on script's current location
 script_location = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_JSON_FILE = os.path.join(script_location, 'Records.json')
@@ -17,59 +33,109 @@ DEFAULT_CENTER_COORDINATES = (-90.0000, 0.0000)  # Arbitrary location near the S
 DEFAULT_RADIUS_METERS = 300  # Default radius in meters
 DEFAULT_TIME_OFFSET_HOURS = 2  # Default time offset in hours
 DEFAULT_MIN_CLUSTER_TIME_MINUTES = 0.5  # Minimum time (in minutes) for a cluster to be valid
+METERS_PER_DEGREE_LAT = 111320.0  # Length of one degree of latitude, used by the flat-Earth radius test
+JSON_CHUNK_SIZE = 100_000  # Number of location records converted per batch
+CSV_ENGINE = 'pyarrow' if importlib.util.find_spec('pyarrow') else 'c'  # Faster streaming CSV reader when pyarrow is installed
+CSV_CHUNK_SIZE = 500_000  # Rows per chunk when streaming the location CSV with pandas
+CSV_BLOCK_SIZE = 32 << 20  # Bytes per batch when streaming the location CSV with pyarrow
+ICS_CACHE_VERSION = 3  # Bump whenever the output of _parse_events_from_ics changes, to invalidate old caches
+ICS_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'GeoTimeTracker')  # Per-user cache of parsed calendars
 
 # Default year and month (current month and year)
 CURRENT_DATE = datetime.now()
 DEFAULT_YEAR = CURRENT_DATE.year
 DEFAULT_MONTH = CURRENT_DATE.month
 
-# JSON to CSV conversion
-def convert_json_to_csv(json_file, csv_file):
+# Convert a batch of raw location records into a typed DataFrame
+def _records_to_df(records):
+    df = pd.DataFrame.from_records(records, columns=['timestamp', 'longitudeE7', 'latitudeE7', 'accuracy'])
+
+    out = pd.DataFrame({
+        'DateTime': pd.to_datetime(df['timestamp'], format='ISO8601', utc=True).dt.tz_localize(None).astype('datetime64[ns]'),
+    })
+    out[['Longitude', 'Latitude']] = df[['longitudeE7', 'latitudeE7']].to_numpy(dtype=np.float64) / 1e7
+    out['Accuracy'] = df['accuracy']
+    return out
+
+# Stream location history data, yielding typed DataFrames of up to JSON_CHUNK_SIZE records
+def _iter_json_chunks(json_file):
     def has_keys(dictionary, keys):
         return all(key in dictionary for key in keys)
 
-    def make_reader(in_json):
-        # Opening location history data
-        with open(in_json, 'r') as file:
-            json_data = json.load(file)
-            
-        # Keys to check in the data
-        keys_to_check = ['timestamp', 'longitudeE7', 'latitudeE7', 'accuracy']
-        
-        # Extract fields from JSON data
-        for item in json_data['locations']:
+    # Keys to check in the data
+    keys_to_check = ['timestamp', 'longitudeE7', 'latitudeE7', 'accuracy']
+
+    records = []
+    with open(json_file, 'rb') as file:
+        for item in ijson.items(file, 'locations.item'):
             if has_keys(item, keys_to_check):
-                timestamp = item['timestamp']
-                if '.' in timestamp:
-                    date = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.%fZ').date()
-                else:
-                    date = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ').date()
-                tm = timestamp.split('T')[1].split('Z')[0]
-                longitude = item['longitudeE7'] / 10000000.0
-                latitude = item['latitudeE7'] / 10000000.0
-                accuracy = item['accuracy']
-                
-                yield [date, tm, longitude, latitude, accuracy]
-
-    features = [['Date', 'Time', 'Longitude', 'Latitude', 'Accuracy']]  # Headers
+                records.append((item['timestamp'], item['longitudeE7'], item['latitudeE7'], item['accuracy']))
+                if len(records) >= JSON_CHUNK_SIZE:
+                    yield _records_to_df(records)
+                    records = []
+    if records:
+        yield _records_to_df(records)
+
+# JSON to DataFrame conversion
+def convert_json_to_dataframe(json_file):
     print(f"Reading JSON file {json_file}")
+    chunks = list(_iter_json_chunks(json_file))
+    if not chunks:
+        return _records_to_df([])
+    return pd.concat(chunks, ignore_index=True)
 
-    reader = make_reader(json_file)
-
-    # Append data to list
-    for r in reader:
-        features.append(r)
+# JSON to CSV conversion
+def convert_json_to_csv(json_file, csv_file):
+    print(f"Reading JSON file {json_file}")
 
-    # Write to CSV file
+    # Write each converted batch to the CSV file as soon as it is parsed
     with open(csv_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerows(features)
-    
+        header = True
+        for chunk in _iter_json_chunks(json_file):
+            chunk.insert(0, 'Date', chunk['DateTime'].dt.strftime('%Y-%m-%d'))
+            chunk.insert(1, 'Time', chunk['DateTime'].dt.strftime('%H:%M:%S'))
+            chunk.drop(columns='DateTime').to_csv(f, header=header, index=False)
+            header = False
+        if header:
+            f.write('Date,Time,Longitude,Latitude,Accuracy\n')
+
     print(f"Conversion complete. Data saved to {csv_file}")
 
-# Check if a point is within the radius
+# Constants of the radius test, cast to the coordinate precision so float32 input is never upcast:
+# (center_lat, center_lon, meters_per_degree_lat, meters_per_degree_lon, radius_sq, half_turn, full_turn)
+def _radius_test_constants(ftype, center_lat, center_lon, radius_meters):
+    return (
+        ftype(center_lat),
+        ftype(center_lon),
+        ftype(METERS_PER_DEGREE_LAT),
+        ftype(METERS_PER_DEGREE_LAT * math.cos(math.radians(center_lat))),
+        ftype(radius_meters) * ftype(radius_meters),
+        ftype(180),
+        ftype(360),
+    )
+
+# Project latitude/longitude onto a local flat plane (meters) centered on the given point
+def _project_to_meters(lat, lon, center_lat, center_lon):
+    lat = np.asarray(lat)
+    lon = np.asarray(lon)
+
+    # Do the math in the input precision (float32 stays float32) instead of upcasting the arrays
+    ftype = np.result_type(lat, lon, np.float32).type
+    center_lat, center_lon, meters_per_degree_lat, meters_per_degree_lon, _, half_turn, full_turn = \
+        _radius_test_constants(ftype, center_lat, center_lon, 0)
+
+    # Wrap the longitude difference into [-180, 180) so points across the antimeridian stay close
+    dlon = (lon - center_lon + half_turn) % full_turn - half_turn
+    dx = dlon * meters_per_degree_lon
+    dy = (lat - center_lat) * meters_per_degree_lat
+    return dx, dy
+
+# Check which points are within the radius (vectorized equirectangular approximation,
+# accurate to well under a meter for radii of a few hundred meters)
 def is_within_radius(lat, lon, center_lat, center_lon, radius_meters):
-    return great_circle((lat, lon), (center_lat, center_lon)).meters <= radius_meters
+    dx, dy = _project_to_meters(lat, lon, center_lat, center_lon)
+    radius_sq = _radius_test_constants(dx.dtype.type, center_lat, center_lon, radius_meters)[4]
+    return dx * dx + dy * dy <= radius_sq
 
 # Round time to the nearest 5 minutes
 def round_to_nearest_5_minutes(dt):
@@ -79,84 +145,318 @@ def round_to_nearest_5_minutes(dt):
         dt += timedelta(minutes=5)
     return dt
 
+# Cluster state carried across chunks: (in_cluster, cluster_start_ns, last_in_radius_ns)
+_NO_OPEN_CLUSTER = (False, 0, 0)
+
+# Single-pass cluster detection over raw arrays: radius test and run bookkeeping fused in one loop.
+# A cluster still open at the end of the arrays is returned as state instead of being closed.
+def _detect_clusters_loop(lat, lon, times_ns, center_lat, center_lon, meters_per_degree_lat, meters_per_degree_lon, radius_sq,
+                          half_turn, full_turn, min_duration_ns, in_cluster, cluster_start, last_in_radius_time):
+    n = lat.shape[0]
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    count = 0
+
+    for i in range(n):
+        dx = ((lon[i] - center_lon + half_turn) % full_turn - half_turn) * meters_per_degree_lon
+        dy = (lat[i] - center_lat) * meters_per_degree_lat
+        if dx * dx + dy * dy <= radius_sq:
+            if not in_cluster:
+                cluster_start = times_ns[i]
+                in_cluster = True
+            last_in_radius_time = times_ns[i]
+        elif in_cluster:
+            if last_in_radius_time - cluster_start >= min_duration_ns:
+                starts[count] = cluster_start
+                ends[count] = last_in_radius_time
+                count += 1
+            in_cluster = False
+
+    return starts[:count], ends[:count], in_cluster, cluster_start, last_in_radius_time
+
+if njit is not None:
+    _detect_clusters_jit = njit(cache=True)(_detect_clusters_loop)
+
+# Find closed clusters in one chunk of points, continuing from (and returning) the carried cluster state
+def _scan_clusters(lat, lon, times_ns, center_lat, center_lon, radius_meters, min_duration_ns, state):
+    if njit is not None:
+        # Same precision as the NumPy path: arrays and constants all in the coordinate dtype
+        ftype = np.result_type(np.asarray(lat), np.asarray(lon), np.float32).type
+        starts, ends, in_cluster, cluster_start, last_in_radius_time = _detect_clusters_jit(
+            np.ascontiguousarray(lat, dtype=ftype),
+            np.ascontiguousarray(lon, dtype=ftype),
+            np.ascontiguousarray(times_ns),
+            *_radius_test_constants(ftype, center_lat, center_lon, radius_meters),
+            float(min_duration_ns),
+            bool(state[0]),
+            np.int64(state[1]),
+            np.int64(state[2])
+        )
+        if not in_cluster:
+            return starts, ends, _NO_OPEN_CLUSTER
+        return starts, ends, (True, int(cluster_start), int(last_in_radius_time))
+
+    mask = is_within_radius(lat, lon, center_lat, center_lon, radius_meters)
+
+    # Re-open a cluster carried over from the previous chunk as two virtual in-radius points
+    in_cluster, cluster_start, last_in_radius_time = state
+    if in_cluster:
+        mask = np.concatenate(([True, True], mask))
+        times_ns = np.concatenate(([cluster_start, last_in_radius_time], times_ns))
+
+    # Contiguous runs of in-radius points: 0->1 edges open a run, 1->0 edges close it
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    starts = np.where(edges == 1)[0]
+    ends = np.where(edges == -1)[0] - 1
+
+    # A run reaching the end of the chunk stays open for the next chunk
+    if len(mask) and mask[-1]:
+        state = (True, int(times_ns[starts[-1]]), int(times_ns[ends[-1]]))
+        starts, ends = starts[:-1], ends[:-1]
+    else:
+        state = _NO_OPEN_CLUSTER
+
+    durations_ns = times_ns[ends] - times_ns[starts]
+    keep = durations_ns >= min_duration_ns
+
+    return times_ns[starts][keep], times_ns[ends][keep], state
+
+# Close a cluster left open after the last chunk and convert all clusters to (entry, exit) timestamps
+def _finish_clusters(start_chunks, end_chunks, state, min_duration_ns):
+    in_cluster, cluster_start, last_in_radius_time = state
+    if in_cluster and last_in_radius_time - cluster_start >= min_duration_ns:
+        start_chunks.append(np.array([cluster_start], dtype=np.int64))
+        end_chunks.append(np.array([last_in_radius_time], dtype=np.int64))
+
+    start_ns = np.concatenate(start_chunks) if start_chunks else np.empty(0, dtype=np.int64)
+    end_ns = np.concatenate(end_chunks) if end_chunks else np.empty(0, dtype=np.int64)
+    return list(zip(pd.to_datetime(start_ns), pd.to_datetime(end_ns)))
+
 # Detect clusters of GPS points within the radius
 def detect_clusters(df, center_lat, center_lon, radius_meters, min_cluster_time_minutes=10):
-    clusters = []
-    current_cluster = []
-    last_in_radius_time = None
-
-    for _, row in df.iterrows():
-        if is_within_radius(row['Latitude'], row['Longitude'], center_lat, center_lon, radius_meters):
-            if not current_cluster:
-                current_cluster.append(row)
-            elif (row['DateTime'] - current_cluster[-1]['DateTime']).seconds > 60:
-                current_cluster.append(row)
-            last_in_radius_time = row['DateTime']
-        else:
-            if current_cluster and last_in_radius_time:
-                duration = (last_in_radius_time - current_cluster[0]['DateTime']).total_seconds() / 60.0
-                if duration >= min_cluster_time_minutes:
-                    clusters.append((current_cluster[0]['DateTime'], last_in_radius_time))
-                current_cluster = []
-    return clusters
+    times_ns = df['DateTime'].to_numpy(dtype='datetime64[ns]').view('i8')
+    min_duration_ns = min_cluster_time_minutes * 60 * 1_000_000_000
+
+    starts, ends, state = _scan_clusters(
+        df['Latitude'].to_numpy(dtype=np.float32), df['Longitude'].to_numpy(dtype=np.float32), times_ns,
+        center_lat, center_lon, radius_meters, min_duration_ns, _NO_OPEN_CLUSTER
+    )
+    return _finish_clusters([starts], [ends], state, min_duration_ns)
 
 # Filter GPS data by year and month
 def filter_csv(df, year, month):
-    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
-        df['Date'] = pd.to_datetime(df['Date'])
-    return df[(df['Date'].dt.year == year) & (df['Date'].dt.month == month)]
-
-# Load and filter events from .ics file
+    start = pd.Timestamp(year, month, 1)
+    end = start + pd.DateOffset(months=1)
+    return df[(df['DateTime'] >= start) & (df['DateTime'] < end)]
+
+# Stream the location CSV in chunks with string Date/Time and float32 Latitude/Longitude columns
+def _iter_csv_chunks(input_file):
+    columns = ['Date', 'Time', 'Latitude', 'Longitude']
+
+    if CSV_ENGINE == 'pyarrow':
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        reader = pa_csv.open_csv(
+            input_file,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={'Date': pa.string(), 'Time': pa.string(), 'Latitude': pa.float32(), 'Longitude': pa.float32()}
+            )
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            input_file,
+            usecols=columns,
+            dtype={'Date': 'string', 'Time': 'string', 'Latitude': 'float32', 'Longitude': 'float32'},
+            chunksize=CSV_CHUNK_SIZE
+        )
+
+# Load and filter events from .ics file, looking the month up in an index built once per file version
 def load_events_from_ics(ics_file, month, year):
-    with open(ics_file, 'r', encoding='utf-8') as f:
-        calendar = Calendar(f.read())
+    stat = os.stat(ics_file)
+    events_by_month = _load_events_index(os.path.abspath(ics_file), stat.st_mtime_ns, stat.st_size)
+    return events_by_month.get((year, month), {})
 
-    events_by_day = defaultdict(list)
+# In-process memo backed by an on-disk pickle (in the per-user cache directory) keyed on the
+# cache format version and the file's path, mtime and size
+@functools.lru_cache(maxsize=4)
+def _load_events_index(ics_file, mtime_ns, size):
+    key = hashlib.sha1(repr((ICS_CACHE_VERSION, ics_file, mtime_ns, size)).encode()).hexdigest()
+    cache_file = os.path.join(ICS_CACHE_DIR, f'ics_{key}.pkl')
 
-    for event in calendar.events:
-        event_start = event.begin.datetime
-        if event_start.month == month and event_start.year == year and '*' in event.name:
-            event_description = f"{event.name} ({event_start.strftime('%H:%M')} - {event.end.strftime('%H:%M') if event.end else ''})"
-            events_by_day[event_start.date()].append(event_description)
-    
-    return events_by_day
+    try:
+        with open(cache_file, 'rb') as f:
+            # Never unpickle a file planted by another user
+            if hasattr(os, 'getuid') and os.fstat(f.fileno()).st_uid != os.getuid():
+                raise OSError(f"Cache file {cache_file} is not owned by the current user")
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    events_by_month = _parse_events_from_ics(ics_file)
+
+    # Write to a temporary file and rename it, so a concurrent run never reads a half-written pickle
+    tmp_file = None
+    try:
+        os.makedirs(ICS_CACHE_DIR, mode=0o700, exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb', dir=ICS_CACHE_DIR, suffix='.tmp', delete=False) as f:
+            tmp_file = f.name
+            pickle.dump(events_by_month, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        if tmp_file is not None and os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return events_by_month
+
+# Read .ics content lines, joining folded continuation lines (RFC 5545)
+def _unfold_ics_lines(ics_file):
+    with open(ics_file, 'r', encoding='utf-8') as f:
+        current = None
+        for raw_line in f:
+            line = raw_line.rstrip('\r\n')
+            if line[:1] in (' ', '\t') and current is not None:
+                current += line[1:]
+                continue
+            if current is not None:
+                yield current
+            current = line
+        if current is not None:
+            yield current
+
+# Parse an .ics DATE or DATE-TIME value, keeping the wall-clock time as written
+def _parse_ics_datetime(value):
+    if 'T' in value:
+        return datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    return datetime.strptime(value[:8], '%Y%m%d')
+
+# Parse an .ics DURATION value such as PT1H30M or P1D
+def _parse_ics_duration(value):
+    match = re.fullmatch(r'([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?', value)
+    if not match:
+        return None
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                         minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -duration if sign == '-' else duration
+
+# Undo .ics text escaping (\, \; \\ and \n)
+def _unescape_ics_text(value):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+# Parse the .ics file into {(year, month): {day: [event descriptions]}}, scanning VEVENTs line by line
+def _parse_events_from_ics(ics_file):
+    events_by_month = {}
+
+    event = None
+    nested_depth = 0
+    for line in _unfold_ics_lines(ics_file):
+        if line == 'BEGIN:VEVENT':
+            event = {}
+            nested_depth = 0
+            continue
+        if event is None:
+            continue
+
+        # Skip properties of sub-components such as VALARM
+        if line.startswith('BEGIN:'):
+            nested_depth += 1
+            continue
+        if line.startswith('END:') and nested_depth:
+            nested_depth -= 1
+            continue
+        if nested_depth:
+            continue
+
+        if line == 'END:VEVENT':
+            name = event.get('SUMMARY', '')
+            if 'DTSTART' in event and '*' in name:
+                event_start = _parse_ics_datetime(event['DTSTART'])
+                duration = _parse_ics_duration(event['DURATION']) if 'DURATION' in event else None
+                if 'DTEND' in event:
+                    event_end = _parse_ics_datetime(event['DTEND'])
+                elif duration is not None:
+                    event_end = event_start + duration
+                elif 'T' in event['DTSTART']:
+                    # RFC 5545: without DTEND/DURATION a DATE-TIME event ends when it starts
+                    event_end = event_start
+                else:
+                    # ...and a DATE (all-day) event lasts one day
+                    event_end = event_start + timedelta(days=1)
+                event_description = f"{name} ({event_start.strftime('%H:%M')} - {event_end.strftime('%H:%M')})"
+                events_by_day = events_by_month.setdefault((event_start.year, event_start.month), defaultdict(list))
+                events_by_day[event_start.date()].append(event_description)
+            event = None
+            continue
+
+        prop, _, value = line.partition(':')
+        prop = prop.split(';', 1)[0].upper()
+        if prop == 'DTSTART':
+            event['DTSTART'] = value
+        elif prop == 'SUMMARY':
+            # Cheap early exit: only events marked with '*' are reported
+            if '*' not in value:
+                event = None
+                continue
+            event['SUMMARY'] = _unescape_ics_text(value)
+        elif prop in ('DTEND', 'DURATION'):
+            event[prop] = value
+
+    return events_by_month
 
 # Function to apply time offset to datetime objects
 def apply_time_offset(time, offset_hours):
     return time + timedelta(hours=offset_hours)
 
 # Main function to analyze location data and integrate with calendar events
-def analyze_location_and_calendar(input_file, ics_file, output_csv, center_lat, center_lon, radius_meters, filter_year, filter_month, time_offset_hours, min_cluster_time_minutes=10):
-    # Check if the input files exist
-    if not os.path.isfile(input_file) or not os.path.isfile(ics_file):
+def analyze_location_and_calendar(input_file, ics_file, output_csv, center_lat, center_lon, radius_meters, filter_year, filter_month, time_offset_hours, min_cluster_time_minutes=10, input_chunks=None):
+    # Check if the input files exist (the CSV is not needed when parsed chunks are passed in)
+    if (input_chunks is None and not os.path.isfile(input_file)) or not os.path.isfile(ics_file):
         print(f"Error: One or both files do not exist in the script directory.")
         return
 
-    # Load GPS data
-    df = pd.read_csv(input_file)
-
-    # Combine 'Date' and 'Time' columns into a single 'DateTime' column
-    try:
-        df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], errors='coerce')
-    except Exception as e:
-        print(f"Error processing DateTime: {e}")
-        return
-
-    # Drop rows with invalid DateTime
-    df = df.dropna(subset=['DateTime'])
-
-    # Ensure latitude and longitude are floats
-    df.loc[:, 'Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
-    df.loc[:, 'Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
-
-    # Drop rows with missing or invalid latitude/longitude
-    df = df.dropna(subset=['Latitude', 'Longitude'])
-
-    # Apply the year and month filter to the GPS data
-    df = filter_csv(df, filter_year, filter_month)
-
-    # Detect clusters (entry/exit times)
-    clusters = detect_clusters(df, center_lat, center_lon, radius_meters, min_cluster_time_minutes)
+    if input_chunks is not None:
+        # GPS data already parsed: an iterable of DataFrames (or a single one) with typed
+        # DateTime/Latitude/Longitude columns, e.g. _iter_json_chunks(json_file)
+        chunks = [input_chunks] if isinstance(input_chunks, pd.DataFrame) else input_chunks
+    else:
+        # Stream GPS data so the full history is never held in memory at once
+        chunks = _iter_csv_chunks(input_file)
+
+    # Single pass over the chunks: filter the month, then carry cluster state from one chunk to the next
+    min_duration_ns = min_cluster_time_minutes * 60 * 1_000_000_000
+    start_chunks, end_chunks = [], []
+    state = _NO_OPEN_CLUSTER
+    for df in chunks:
+        if input_chunks is None:
+            # Keep only the requested month (cheap string prefix match) before parsing any dates
+            df = df[df['Date'].str.startswith(f"{filter_year}-{filter_month:02d}", na=False)]
+
+            # Combine 'Date' and 'Time' columns into a single 'DateTime' column
+            try:
+                df = df.assign(DateTime=pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce') + pd.to_timedelta(df['Time'], errors='coerce'))
+            except Exception as e:
+                print(f"Error processing DateTime: {e}")
+                return
+
+        # Apply the year and month filter (rows with an invalid DateTime never fall inside the range)
+        df = filter_csv(df, filter_year, filter_month)
+
+        # Drop rows with missing or invalid latitude/longitude
+        df = df.dropna(subset=['Latitude', 'Longitude'])
+
+        # Detect clusters (entry/exit times); coordinates are downcast to float32 only for the radius test
+        starts, ends, state = _scan_clusters(
+            df['Latitude'].to_numpy(dtype=np.float32), df['Longitude'].to_numpy(dtype=np.float32), df['DateTime'].to_numpy(dtype='datetime64[ns]').view('i8'),
+            center_lat, center_lon, radius_meters, min_duration_ns, state
+        )
+        start_chunks.append(starts)
+        end_chunks.append(ends)
+
+    clusters = _finish_clusters(start_chunks, end_chunks, state, min_duration_ns)
 
     # Load events from the calendar
     events_by_day = load_events_from_ics(ics_file, filter_month, filter_year)
@@ -199,13 +499,11 @@ def analyze_location_and_calendar(input_file, ics_file, output_csv, center_lat,
         })
 
     # Create DataFrame
-    df_entries = pd.DataFrame(entry_exit_pairs)
+    df_entries = pd.DataFrame(entry_exit_pairs, columns=['Date', 'Event', 'Work Duration', 'From', 'To'])
 
     # Calculate total work time
-    total_duration_minutes = sum(
-        [(datetime.strptime(row['To'], '%H:%M:%S') - datetime.strptime(row['From'], '%H:%M:%S')).total_seconds() / 60.0 
-         for _, row in df_entries.iterrows() if row['From'] and row['To']]
-    )
+    durations = pd.to_timedelta(df_entries['To']) - pd.to_timedelta(df_entries['From'])
+    total_duration_minutes = durations[durations.notna()].sum().total_seconds() / 60.0
     total_hours = int(total_duration_minutes // 60)
     total_minutes = int(total_duration_minutes % 60)
     total_time_str = f"{total_hours:02}:{total_minutes:02}:00"
@@ -225,13 +523,15 @@ def analyze_location_and_calendar(input_file, ics_file, output_csv, center_lat,
     print(f"Work hours and events saved to {output_csv}")
 
 if __name__ == "__main__":
-    # First, convert JSON to CSV
-    convert_json_to_csv(DEFAULT_JSON_FILE, DEFAULT_INPUT_FILE)
-    
-    # Then, analyze work hours and calendar events
+    # Stream the JSON location history in typed batches straight into the analysis,
+    # so the full history is never held in memory at once
+    print(f"Reading JSON file {DEFAULT_JSON_FILE}")
+    location_chunks = _iter_json_chunks(DEFAULT_JSON_FILE)
+
+    # Analyze work hours and calendar events
     output_csv = os.path.join(script_location, f"work_hours_{DEFAULT_YEAR}_{DEFAULT_MONTH}.csv")
     analyze_location_and_calendar(
-        DEFAULT_INPUT_FILE, 
+        None, 
         DEFAULT_ICS_FILE, 
         output_csv, 
         DEFAULT_CENTER_COORDINATES[0], 
@@ -240,5 +540,6 @@ if __name__ == "__main__":
         DEFAULT_YEAR, 
         DEFAULT_MONTH, 
         DEFAULT_TIME_OFFSET_HOURS, 
-        DEFAULT_MIN_CLUSTER_TIME_MINUTES
+        DEFAULT_MIN_CLUSTER_TIME_MINUTES,
+        input_chunks=location_chunks
     )